@@ -13,17 +13,62 @@ import argparse
 import csv
 import datetime as dt
 import difflib
+import functools
+import gzip
+import hashlib
+import html
+import http.client
 import json
 import math
 import re
-import subprocess
+import threading
 import time
 import unicodedata
+import zlib
+from bisect import bisect_right
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 CLUB_SALARIES_URL = "https://www.capology.com/club/{slug}/salaries/"
 TRANSFERS_URL = "https://raw.githubusercontent.com/eordo/transfermarkt-data/master/{league_path}/{season}.csv"
+FETCH_WORKERS = 8
+PREFETCH_WORKERS = 12
+CLUB_TOKEN_MATCH_CUTOFF = 0.7
+PLAYER_TOKEN_MATCH_CUTOFF = 0.7
+PROFILE_MAX_CONTRACT_YEARS = 5
+TRANSFER_CSV_COLUMNS = (
+    "league",
+    "season",
+    "club",
+    "movement",
+    "fee",
+    "age",
+    "is_loan",
+    "player_name",
+    "pos",
+    "market_value",
+    "window",
+)
+FETCH_TIMEOUT_SECONDS = 30
+MAX_REDIRECTS = 5
+FETCH_ATTEMPTS = 5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_RETRY_AFTER_SECONDS = 60
+HOST_MIN_INTERVAL_SECONDS = {"www.capology.com": 0.25}
+CACHE_TTL_SECONDS = 6 * 60 * 60
+USER_AGENT = (
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
 
 LEAGUES = [
     {
@@ -42,6 +87,37 @@ LEAGUES = [
     },
 ]
 
+NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+ASCII_NORMALIZE_TABLE = str.maketrans(
+    {
+        codepoint: " and " if codepoint == ord("&") else chr(codepoint).lower() if chr(codepoint).isalnum() else " "
+        for codepoint in range(128)
+    }
+)
+HTML_TAG_RE = re.compile(r"<[^>]+>")
+JS_TOKEN_RE = re.compile(r"[\[\]{}\"']")
+PAYROLL_CLUB_RE = re.compile(r'"club"\s*:\s*"(.*?)"\s*,', re.S)
+PAYROLL_ANNUAL_GBP_RE = re.compile(r'"annual_gross_gbp"\s*:\s*accounting\.formatMoney\("([0-9.\-]+)"')
+CLUB_SLUG_RE = re.compile(r"href='/club/([^/]+)/")
+CLUB_LINK_RE = re.compile(r"\s*<a\s[^>]*?href='/club/(?P<slug>[^/]+)/[^>]*>(?P<name>[^<]*)</a>\s*")
+CONTRACT_NAME_RE = re.compile(r"'name'\s*:\s*\"(.*?)\"\s*,", re.S)
+CONTRACT_FIELD_RE = re.compile(
+    r"'(?P<field>signed|expiration|years|position|age|annual_gross_gbp|active)'\s*:\s*"
+    r"(?:moment\(\"(?P<moment>[^\"]*)\"\)"
+    r"|Math\.round\(\"(?P<round>[^\"]*)\"\)"
+    r"|accounting\.formatMoney\(\"(?P<money>[0-9.\-]+)\""
+    r"|\"(?P<string>[^\"]*)\")"
+)
+CONTRACT_FIELD_FORMS = {
+    "signed": "moment",
+    "expiration": "moment",
+    "years": "string",
+    "position": "string",
+    "age": "round",
+    "annual_gross_gbp": "money",
+    "active": "string",
+}
+
 CLUB_ALIASES = {
     "afc bournemouth": "Bournemouth",
     "arsenal fc": "Arsenal",
@@ -83,129 +159,276 @@ CLUB_ALIASES = {
 }
 
 
-def fetch_text(url: str) -> str:
-    cmd = [
-        "curl",
-        "-L",
-        "--http1.1",
-        "--fail",
-        "--silent",
-        "--show-error",
-        "--retry",
-        "3",
-        "--retry-all-errors",
-        "--retry-delay",
-        "1",
-        "-A",
-        (
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
-        ),
-        url,
-    ]
-    errors: List[str] = []
-    for attempt in range(5):
-        completed = subprocess.run(cmd, capture_output=True, text=True)
-        if completed.returncode == 0:
-            return completed.stdout
-        err = completed.stderr.strip() or f"curl exit code {completed.returncode}"
-        errors.append(err)
-        wait_seconds = (2 ** attempt) if "429" in err else 1
-        time.sleep(wait_seconds)
-    raise RuntimeError(f"Unable to fetch {url}: {' | '.join(errors)}")
+_http_local = threading.local()
+_request_slot_lock = threading.Lock()
+_next_request_at: Dict[str, float] = {}
+
+
+def wait_for_request_slot(netloc: str) -> None:
+    interval = HOST_MIN_INTERVAL_SECONDS.get(netloc)
+    if not interval:
+        return
+    with _request_slot_lock:
+        now = time.monotonic()
+        slot = max(now, _next_request_at.get(netloc, now))
+        _next_request_at[netloc] = slot + interval
+    if slot > now:
+        time.sleep(slot - now)
+
+
+def get_connection(scheme: str, netloc: str) -> http.client.HTTPConnection:
+    connections = getattr(_http_local, "connections", None)
+    if connections is None:
+        connections = _http_local.connections = {}
+    conn = connections.get((scheme, netloc))
+    if conn is None:
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        conn = conn_cls(netloc, timeout=FETCH_TIMEOUT_SECONDS)
+        connections[(scheme, netloc)] = conn
+    return conn
+
+
+def drop_connection(scheme: str, netloc: str) -> None:
+    conn = getattr(_http_local, "connections", {}).pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+def send_request(
+    scheme: str, netloc: str, path: str, headers: Dict[str, str]
+) -> tuple[http.client.HTTPResponse, bytes]:
+    while True:
+        conn = get_connection(scheme, netloc)
+        reused = conn.sock is not None
+        try:
+            conn.request("GET", path, headers=headers)
+            response = conn.getresponse()
+            return response, response.read()
+        except (http.client.HTTPException, OSError) as exc:
+            drop_connection(scheme, netloc)
+            if not (reused and isinstance(exc, (ConnectionResetError, BrokenPipeError))):
+                raise
+
+
+def http_get(url: str, extra_headers: Optional[Dict[str, str]] = None) -> tuple[int, str, http.client.HTTPMessage]:
+    request_headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip", **(extra_headers or {})}
+    for _ in range(MAX_REDIRECTS + 1):
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        wait_for_request_slot(parts.netloc)
+        response, body = send_request(parts.scheme, parts.netloc, path, request_headers)
+
+        location = response.getheader("Location")
+        if response.status in {301, 302, 303, 307, 308} and location:
+            url = urljoin(url, location)
+            continue
 
+        charset = response.headers.get_content_charset() or "utf-8"
+        try:
+            if (response.getheader("Content-Encoding") or "").lower() == "gzip":
+                body = gzip.decompress(body)
+            text = body.decode(charset, errors="replace")
+        except (EOFError, LookupError, OSError, zlib.error) as exc:
+            raise http.client.HTTPException(f"unreadable response body: {exc}") from exc
+        return response.status, text, response.headers
 
-def normalize_text(value: str) -> str:
-    normalized = unicodedata.normalize("NFKD", value)
-    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
-    normalized = normalized.lower()
-    normalized = normalized.replace("&", " and ")
-    normalized = re.sub(r"[^a-z0-9]+", " ", normalized)
-    return re.sub(r"\s+", " ", normalized).strip()
+    raise http.client.HTTPException(f"more than {MAX_REDIRECTS} redirects")
 
 
-def extract_js_array_objects(page: str, marker: str = "var data = [") -> List[str]:
-    start_idx = page.find(marker)
-    if start_idx == -1:
-        return []
-    arr_start = page.find("[", start_idx)
-    if arr_start == -1:
-        return []
+def cache_path_for(url: str, cache_dir: Path) -> Path:
+    return cache_dir / f"{hashlib.sha1(url.encode('utf-8')).hexdigest()}.txt"
 
-    depth = 0
-    in_string = False
-    quote_char = ""
-    escaped = False
-    arr_end = -1
 
-    for i in range(arr_start, len(page)):
-        ch = page[i]
-        if in_string:
-            if escaped:
-                escaped = False
-            elif ch == "\\":
-                escaped = True
-            elif ch == quote_char:
-                in_string = False
-            continue
+def validators_path_for(cache_path: Path) -> Path:
+    return cache_path.with_suffix(".validators.json")
 
-        if ch in ('"', "'"):
-            in_string = True
-            quote_char = ch
-        elif ch == "[":
-            depth += 1
-        elif ch == "]":
-            depth -= 1
-            if depth == 0:
-                arr_end = i
+
+def read_cached_text(cache_path: Path) -> Optional[str]:
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+
+def cache_is_fresh(cache_path: Path) -> bool:
+    try:
+        return time.time() - cache_path.stat().st_mtime < CACHE_TTL_SECONDS
+    except OSError:
+        return False
+
+
+def read_cache_validators(cache_path: Path) -> Dict[str, str]:
+    try:
+        validators = json.loads(validators_path_for(cache_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    conditional_headers: Dict[str, str] = {}
+    if validators.get("etag"):
+        conditional_headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        conditional_headers["If-Modified-Since"] = validators["last_modified"]
+    return conditional_headers
+
+
+def write_atomic_text(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def write_cached_text(cache_path: Path, text: str, headers: http.client.HTTPMessage) -> None:
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    write_atomic_text(cache_path, text)
+    validators = {"etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified")}
+    if any(validators.values()):
+        write_atomic_text(validators_path_for(cache_path), json.dumps(validators))
+    else:
+        validators_path_for(cache_path).unlink(missing_ok=True)
+
+
+def retry_after_seconds(value: Optional[str]) -> Optional[float]:
+    if not value or not value.strip().isdigit():
+        return None
+    return min(float(value), MAX_RETRY_AFTER_SECONDS)
+
+
+def fetch_text(url: str, cache_dir: Optional[Path] = None) -> str:
+    cache_path = cache_path_for(url, cache_dir) if cache_dir is not None else None
+    cached = None
+    conditional_headers: Dict[str, str] = {}
+    if cache_path is not None:
+        cached = read_cached_text(cache_path)
+        if cached is not None:
+            if cache_is_fresh(cache_path):
+                return cached
+            conditional_headers = read_cache_validators(cache_path)
+
+    errors: List[str] = []
+    for attempt in range(FETCH_ATTEMPTS):
+        retry_after = None
+        try:
+            status, text, headers = http_get(url, conditional_headers)
+        except (http.client.HTTPException, OSError) as exc:
+            errors.append(str(exc) or type(exc).__name__)
+        else:
+            if status == 304 and cache_path is not None and cached is not None:
+                try:
+                    cache_path.touch()
+                except OSError as exc:
+                    print(f"Warning: could not refresh cache for {url}: {exc}")
+                return cached
+            if status < 400:
+                if cache_path is not None:
+                    try:
+                        write_cached_text(cache_path, text, headers)
+                    except OSError as exc:
+                        print(f"Warning: could not cache {url}: {exc}")
+                return text
+            errors.append(f"HTTP {status}")
+            if status not in RETRY_STATUSES:
                 break
+            retry_after = retry_after_seconds(headers.get("Retry-After"))
+        if attempt + 1 < FETCH_ATTEMPTS:
+            time.sleep(retry_after if retry_after is not None else 2 ** attempt)
+    raise RuntimeError(f"Unable to fetch {url}: {' | '.join(errors)}")
 
-    if arr_end == -1:
-        return []
 
-    block = page[arr_start + 1 : arr_end]
-    return split_top_level_objects(block)
+class CombiningMarkTable(dict):
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        mapped = None if unicodedata.combining(chr(codepoint)) else codepoint
+        self[codepoint] = mapped
+        return mapped
 
 
-def split_top_level_objects(block: str) -> List[str]:
-    objects: List[str] = []
-    depth = 0
-    in_string = False
-    quote_char = ""
-    escaped = False
-    obj_start = -1
+COMBINING_MARK_TABLE = CombiningMarkTable()
 
-    for i, ch in enumerate(block):
-        if in_string:
-            if escaped:
-                escaped = False
-            elif ch == "\\":
-                escaped = True
-            elif ch == quote_char:
-                in_string = False
-            continue
 
+@functools.lru_cache(maxsize=16384)
+def normalize_text(value: str) -> str:
+    if value.isascii():
+        return " ".join(value.translate(ASCII_NORMALIZE_TABLE).split())
+    normalized = unicodedata.normalize("NFKD", value).translate(COMBINING_MARK_TABLE)
+    normalized = normalized.lower()
+    normalized = normalized.replace("&", " and ")
+    return NON_ALNUM_RE.sub(" ", normalized).strip()
+
+
+def skip_js_string(text: str, start: int) -> int:
+    quote_char = text[start]
+    pos = start + 1
+    while True:
+        end = text.find(quote_char, pos)
+        if end == -1:
+            return -1
+        escape_pos = end - 1
+        while escape_pos > start and text[escape_pos] == "\\":
+            escape_pos -= 1
+        if (end - 1 - escape_pos) % 2 == 0:
+            return end + 1
+        pos = end + 1
+
+
+def scan_top_level_objects(page: str, arr_start: int) -> Optional[List[Tuple[int, int]]]:
+    spans: List[Tuple[int, int]] = []
+    bracket_depth = 0
+    brace_depth = 0
+    obj_start = -1
+    pos = arr_start
+
+    while True:
+        token = JS_TOKEN_RE.search(page, pos)
+        if token is None:
+            return None
+        i = token.start()
+        ch = page[i]
         if ch in ('"', "'"):
-            in_string = True
-            quote_char = ch
+            pos = skip_js_string(page, i)
+            if pos == -1:
+                return None
             continue
 
-        if ch == "{":
-            if depth == 0:
+        if ch == "[":
+            bracket_depth += 1
+        elif ch == "]":
+            bracket_depth -= 1
+            if bracket_depth == 0:
+                return spans
+        elif ch == "{":
+            if brace_depth == 0:
                 obj_start = i
-            depth += 1
-        elif ch == "}":
-            depth -= 1
-            if depth == 0 and obj_start != -1:
-                objects.append(block[obj_start : i + 1])
+            brace_depth += 1
+        else:
+            brace_depth -= 1
+            if brace_depth == 0 and obj_start != -1:
+                spans.append((obj_start, i + 1))
                 obj_start = -1
+        pos = i + 1
 
-    return objects
+
+def extract_js_array_objects(page: str, marker: str = "var data = [") -> List[str]:
+    start_idx = page.find(marker)
+    if start_idx == -1:
+        return []
+    arr_start = page.find("[", start_idx)
+    if arr_start == -1:
+        return []
+
+    spans = scan_top_level_objects(page, arr_start)
+    if spans is None:
+        return []
+    return [page[obj_start:obj_end] for obj_start, obj_end in spans]
 
 
 def html_to_text(html_fragment: str) -> str:
-    stripped = re.sub(r"<[^>]+>", "", html_fragment)
-    return stripped.replace("&#39;", "'").replace("&amp;", "&").strip()
+    text = html_fragment
+    if "<" in text:
+        text = HTML_TAG_RE.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return text.strip()
 
 
 def parse_capology_payrolls(page: str) -> List[dict]:
@@ -213,23 +436,27 @@ def parse_capology_payrolls(page: str) -> List[dict]:
     parsed: List[dict] = []
 
     for row in rows:
-        club_html_match = re.search(r'"club"\s*:\s*"(.*?)"\s*,', row, re.S)
-        annual_gbp_match = re.search(
-            r'"annual_gross_gbp"\s*:\s*accounting\.formatMoney\("([0-9.\-]+)"', row
-        )
+        club_html_match = PAYROLL_CLUB_RE.search(row)
+        annual_gbp_match = PAYROLL_ANNUAL_GBP_RE.search(row)
         if not club_html_match or not annual_gbp_match:
             continue
 
         club_html = club_html_match.group(1)
-        club_name = html_to_text(club_html)
-        slug_match = re.search(r"href='/club/([^/]+)/", club_html)
-        if not slug_match:
-            continue
+        link_match = CLUB_LINK_RE.fullmatch(club_html)
+        if link_match:
+            club_name = html_to_text(link_match.group("name"))
+            slug = link_match.group("slug")
+        else:
+            club_name = html_to_text(club_html)
+            slug_match = CLUB_SLUG_RE.search(club_html)
+            if not slug_match:
+                continue
+            slug = slug_match.group(1)
 
         parsed.append(
             {
                 "club": club_name,
-                "slug": slug_match.group(1),
+                "slug": slug,
                 "annual_gross_gbp": float(annual_gbp_match.group(1)),
             }
         )
@@ -242,53 +469,53 @@ def parse_capology_salary_contracts(page: str) -> Dict[str, dict]:
     by_name: Dict[str, dict] = {}
 
     for row in rows:
-        name_match = re.search(r"'name'\s*:\s*\"(.*?)\"\s*,", row, re.S)
-        signed_match = re.search(r"'signed'\s*:\s*moment\(\"([^\"]*)\"\)", row)
-        expiration_match = re.search(r"'expiration'\s*:\s*moment\(\"([^\"]*)\"\)", row)
-        years_match = re.search(r"'years'\s*:\s*\"([^\"]*)\"", row)
-        position_match = re.search(r"'position'\s*:\s*\"([^\"]*)\"", row)
-        age_match = re.search(r"'age'\s*:\s*Math\.round\(\"([^\"]*)\"\)", row)
-        annual_gross_match = re.search(
-            r"'annual_gross_gbp'\s*:\s*accounting\.formatMoney\(\"([0-9.\-]+)\"",
-            row,
-        )
-        active_match = re.search(r"'active'\s*:\s*\"([^\"]*)\"", row)
-
+        name_match = CONTRACT_NAME_RE.search(row)
         if not name_match:
             continue
 
-        if active_match and active_match.group(1) != "True":
+        fields: Dict[str, str] = {}
+        for match in CONTRACT_FIELD_RE.finditer(row):
+            field = match.group("field")
+            value = match.group(CONTRACT_FIELD_FORMS[field])
+            if value is not None:
+                fields.setdefault(field, value)
+
+        if fields.get("active", "True") != "True":
             continue
 
         player_name = html_to_text(name_match.group(1))
         norm_name = normalize_text(player_name)
 
-        signed = parse_iso_date(signed_match.group(1) if signed_match else "")
-        expiration = parse_iso_date(expiration_match.group(1) if expiration_match else "")
+        signed = parse_iso_date(fields.get("signed", ""))
+        expiration = parse_iso_date(fields.get("expiration", ""))
 
         remaining_years = None
-        if years_match and years_match.group(1).strip().isdigit():
-            remaining_years = int(years_match.group(1).strip())
+        years = fields.get("years", "").strip()
+        if years.isdigit():
+            remaining_years = int(years)
 
         age = None
-        if age_match and age_match.group(1).strip().isdigit():
-            age = int(age_match.group(1).strip())
+        age_text = fields.get("age", "").strip()
+        if age_text.isdigit():
+            age = int(age_text)
 
+        annual_gross = fields.get("annual_gross_gbp")
         by_name[norm_name] = {
             "player": player_name,
             "signed": signed,
             "expiration": expiration,
             "remaining_years": remaining_years,
-            "position": position_match.group(1) if position_match else "",
+            "position": fields.get("position", ""),
             "age": age,
-            "annual_gross_gbp": float(annual_gross_match.group(1)) if annual_gross_match else None,
+            "annual_gross_gbp": float(annual_gross) if annual_gross is not None else None,
         }
 
     return by_name
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_iso_date(value: str) -> Optional[dt.date]:
-    if not value:
+    if len(value) < 7 or not value[:4].isdigit():
         return None
     try:
         return dt.date.fromisoformat(value)
@@ -296,19 +523,55 @@ def parse_iso_date(value: str) -> Optional[dt.date]:
         return None
 
 
+def build_token_index(keys: List[str]) -> Dict[str, Set[str]]:
+    token_index: Dict[str, Set[str]] = {}
+    for key in keys:
+        for token in key.split():
+            token_index.setdefault(token, set()).add(key)
+    return token_index
+
+
+def best_token_overlap(normalized: str, token_index: Dict[str, Set[str]], cutoff: float) -> Optional[str]:
+    tokens = set(normalized.split())
+    candidates: Set[str] = set()
+    for token in tokens:
+        candidates.update(token_index.get(token, ()))
+
+    best_key = None
+    best_score = 0.0
+    for key in sorted(candidates):
+        key_tokens = set(key.split())
+        score = len(tokens & key_tokens) / len(tokens | key_tokens)
+        if score > best_score:
+            best_key = key
+            best_score = score
+
+    if best_score >= cutoff:
+        return best_key
+    return None
+
+
 def match_player_contract(
-    player_name: str,
+    player_norm: str,
     club_contracts: Dict[str, dict],
+    candidates: Optional[List[str]] = None,
+    token_index: Optional[Dict[str, Set[str]]] = None,
 ) -> tuple[Optional[dict], str]:
-    norm = normalize_text(player_name)
-    if norm in club_contracts:
-        return club_contracts[norm], "exact"
+    if player_norm in club_contracts:
+        return club_contracts[player_norm], "exact"
 
     if not club_contracts:
         return None, "none"
 
-    candidates = list(club_contracts.keys())
-    matches = difflib.get_close_matches(norm, candidates, n=1, cutoff=0.9)
+    if candidates is None:
+        candidates = list(club_contracts.keys())
+    if token_index is None:
+        token_index = build_token_index(candidates)
+    token_match = best_token_overlap(player_norm, token_index, PLAYER_TOKEN_MATCH_CUTOFF)
+    if token_match:
+        return club_contracts[token_match], "fuzzy"
+
+    matches = difflib.get_close_matches(player_norm, candidates, n=1, cutoff=0.9)
     if matches:
         return club_contracts[matches[0]], "fuzzy"
 
@@ -350,17 +613,30 @@ def infer_contract_years_from_profile(age: Optional[int], position: str, fee: fl
     if position in {"GK"} and age is not None and age <= 26:
         years = max(years, 5)
 
-    return years
+    return min(years, PROFILE_MAX_CONTRACT_YEARS)
 
 
-def normalize_club(raw_club: str, canonical_map: Dict[str, str]) -> Optional[str]:
+def normalize_club(
+    raw_club: str,
+    canonical_map: Dict[str, str],
+    canonical_keys: Optional[List[str]] = None,
+    token_index: Optional[Dict[str, Set[str]]] = None,
+) -> Optional[str]:
     normalized = normalize_text(raw_club)
     if normalized in CLUB_ALIASES:
         return CLUB_ALIASES[normalized]
     if normalized in canonical_map:
         return canonical_map[normalized]
 
-    best_match = difflib.get_close_matches(normalized, list(canonical_map.keys()), n=1, cutoff=0.85)
+    if token_index is None:
+        token_index = build_token_index(list(canonical_map.keys()))
+    token_match = best_token_overlap(normalized, token_index, CLUB_TOKEN_MATCH_CUTOFF)
+    if token_match:
+        return canonical_map[token_match]
+
+    if canonical_keys is None:
+        canonical_keys = list(canonical_map.keys())
+    best_match = difflib.get_close_matches(normalized, canonical_keys, n=1, cutoff=0.85)
     if best_match:
         return canonical_map[best_match[0]]
     return None
@@ -371,39 +647,79 @@ def parse_transfers_csv(
     season_year: int,
     canonical_map: Dict[str, str],
     transfer_names: set[str],
+    club_by_raw_name: Optional[Dict[str, Optional[str]]] = None,
 ) -> Dict[str, dict]:
     by_club: Dict[str, dict] = {}
-    reader = csv.DictReader(csv_text.splitlines())
+    reader = csv.reader(csv_text.splitlines())
+    header = next(reader, None)
+    if header is None:
+        return by_club
+
+    column_index = {name: idx for idx, name in enumerate(header)}
+    header_width = row_width = len(header)
+    for name in TRANSFER_CSV_COLUMNS:
+        if name not in column_index:
+            column_index[name] = row_width
+            row_width += 1
+    padding = [""] * row_width
+    (
+        league_idx,
+        season_idx,
+        club_idx,
+        movement_idx,
+        fee_idx,
+        age_idx,
+        is_loan_idx,
+        player_idx,
+        pos_idx,
+        market_value_idx,
+        window_idx,
+    ) = (column_index[name] for name in TRANSFER_CSV_COLUMNS)
+
     allowed_names = {name.lower() for name in transfer_names}
+    canonical_keys = list(canonical_map.keys())
+    token_index = build_token_index(canonical_keys)
+    if club_by_raw_name is None:
+        club_by_raw_name = {}
+    season_by_raw: Dict[str, Optional[int]] = {}
 
     for row in reader:
-        row_league = (row.get("league") or "").strip().lower()
+        if not row:
+            continue
+        if row_width != header_width or len(row) < header_width:
+            row = row[:header_width] + padding[min(len(row), header_width) :]
+
+        row_league = row[league_idx].strip().lower()
         if row_league not in allowed_names:
             continue
-        row_season = safe_int(row.get("season") or "")
+        raw_season = row[season_idx]
+        if raw_season not in season_by_raw:
+            season_by_raw[raw_season] = safe_int(raw_season)
+        row_season = season_by_raw[raw_season]
         if row_season != season_year:
             continue
 
-        club = normalize_club(row.get("club", ""), canonical_map)
+        raw_club = row[club_idx]
+        if raw_club not in club_by_raw_name:
+            club_by_raw_name[raw_club] = normalize_club(raw_club, canonical_map, canonical_keys, token_index)
+        club = club_by_raw_name[raw_club]
         if not club:
             continue
 
-        movement = (row.get("movement") or "").strip().lower()
+        movement = row[movement_idx].strip().lower()
         if movement not in {"in", "out"}:
             continue
 
-        fee = safe_float(row.get("fee", "0"))
-        age = safe_int(row.get("age", ""))
-        is_loan = str(row.get("is_loan", "0")).strip() == "1"
-
+        player = (row[player_idx] or "Unknown").strip()
         item = {
-            "player": (row.get("player_name") or "Unknown").strip(),
-            "fee": fee,
-            "age": age,
-            "position": (row.get("pos") or "").strip(),
-            "market_value": safe_float(row.get("market_value", "0")),
-            "is_loan": is_loan,
-            "window": (row.get("window") or "").strip().lower(),
+            "player": player,
+            "player_norm": normalize_text(player),
+            "fee": safe_float(row[fee_idx]),
+            "age": safe_int(row[age_idx]),
+            "position": row[pos_idx].strip(),
+            "market_value": safe_float(row[market_value_idx]),
+            "is_loan": row[is_loan_idx].strip() == "1",
+            "window": row[window_idx].strip().lower(),
             "season": row_season,
             "source": "transfermarkt_data_github",
         }
@@ -423,11 +739,13 @@ def merge_transfer_rows(base: Dict[str, dict], extra: Dict[str, dict]) -> None:
 
 def resolve_contract_terms(
     move: dict,
-    club: str,
+    club_norm: str,
+    overrides: Dict[Tuple[str, str], dict],
     contracts: Dict[str, dict],
-    overrides: Dict[str, dict],
+    contract_candidates: List[str],
+    contract_token_index: Dict[str, Set[str]],
 ) -> dict:
-    player = move["player"]
+    player_norm = move["player_norm"]
     fee = move["fee"]
     age = move["age"]
     position = move["position"]
@@ -437,14 +755,15 @@ def resolve_contract_terms(
     reason = "Profile-based fallback (age/position/fee)."
     contract_record = None
 
-    club_override = overrides.get(normalize_text(club), {})
-    player_override = club_override.get(normalize_text(player))
+    player_override = overrides.get((club_norm, player_norm))
     if player_override and player_override.get("contract_years"):
         contract_years = int(player_override["contract_years"])
         confidence = "override"
         reason = player_override.get("note", "Manual override.")
     else:
-        contract_record, match_type = match_player_contract(player, contracts)
+        contract_record, match_type = match_player_contract(
+            player_norm, contracts, contract_candidates, contract_token_index
+        )
         if contract_record:
             reported_years = infer_contract_years_from_dates(
                 contract_record.get("signed"), contract_record.get("expiration")
@@ -460,9 +779,11 @@ def resolve_contract_terms(
 
     if contract_years is None:
         contract_years = infer_contract_years_from_profile(age, position, fee, move["is_loan"])
+    contract_years = int(contract_years)
 
     return {
-        "contract_years": int(contract_years),
+        "contract_years": contract_years,
+        "annual_amortization": int(round((fee or 0) / max(1, contract_years))),
         "contract_confidence": confidence,
         "contract_note": reason,
         "annual_wage_gbp": (
@@ -473,18 +794,21 @@ def resolve_contract_terms(
     }
 
 
+def contract_terms_key(move: dict) -> tuple:
+    return (move["player"], move["fee"], move["age"], move["position"], move["is_loan"])
+
+
 def player_left_club_after_incoming(
-    incoming_player: str,
+    incoming_player_norm: str,
     incoming_season: int,
     outgoing_by_player: Dict[str, List[int]],
     target_season: int,
 ) -> bool:
-    norm = normalize_text(incoming_player)
-    out_seasons = outgoing_by_player.get(norm, [])
-    for out_season in out_seasons:
-        if incoming_season < out_season <= target_season:
-            return True
-    return False
+    out_seasons = outgoing_by_player.get(incoming_player_norm)
+    if not out_seasons:
+        return False
+    idx = bisect_right(out_seasons, incoming_season)
+    return idx < len(out_seasons) and out_seasons[idx] <= target_season
 
 
 def safe_float(value: str) -> float:
@@ -501,26 +825,56 @@ def safe_int(value: str) -> Optional[int]:
         return None
 
 
-def load_contract_overrides(path: Path) -> Dict[str, dict]:
+def read_json(path: Path) -> dict:
+    raw_bytes = path.read_bytes()
+    if orjson is not None:
+        return orjson.loads(raw_bytes)
+    return json.loads(raw_bytes)
+
+
+def write_json(path: Path, payload: dict, compact: bool = False) -> None:
+    if orjson is not None:
+        option = orjson.OPT_APPEND_NEWLINE if compact else orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+        path.write_bytes(orjson.dumps(payload, option=option))
+        return
+    if compact:
+        text = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    else:
+        text = json.dumps(payload, indent=2, ensure_ascii=False)
+    path.write_text(text + "\n", encoding="utf-8")
+
+
+def load_contract_overrides(path: Path) -> Dict[Tuple[str, str], dict]:
     if not path.exists():
         return {}
-    with path.open("r", encoding="utf-8") as f:
-        raw = json.load(f)
+    raw = read_json(path)
 
-    normalized: Dict[str, dict] = {}
+    overrides: Dict[Tuple[str, str], dict] = {}
     for club, players in raw.items():
-        club_key = normalize_text(club)
-        normalized[club_key] = {}
+        club_norm = normalize_text(club)
         for player_name, payload in players.items():
-            normalized[club_key][normalize_text(player_name)] = payload
-    return normalized
+            overrides[(club_norm, normalize_text(player_name))] = payload
+    return overrides
 
 
-def build_dataset(output_path: Path, season_year: int, overrides_path: Path, history_years: int) -> None:
+def build_dataset(
+    output_path: Path,
+    season_year: int,
+    overrides_path: Path,
+    history_years: int,
+    cache_dir: Optional[Path] = None,
+    compact: bool = False,
+) -> None:
     fetched_at = dt.datetime.now(dt.timezone.utc)
     transfer_start_year = max(1992, season_year - max(0, history_years))
     season_label = f"{season_year}/{str(season_year + 1)[-2:]}"
     overrides = load_contract_overrides(overrides_path)
+    override_years_by_club: Dict[str, int] = {}
+    for (override_club, _), override in overrides.items():
+        if override.get("contract_years"):
+            override_years_by_club[override_club] = max(
+                override_years_by_club.get(override_club, 0), int(override["contract_years"])
+            )
 
     output_clubs: List[dict] = []
     source_rows: List[dict] = []
@@ -528,6 +882,22 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
     total_incoming = 0
     total_reported = 0
 
+    transfer_years = range(transfer_start_year, season_year + 1)
+    with ThreadPoolExecutor(max_workers=PREFETCH_WORKERS) as executor:
+        payroll_futures = {
+            league_cfg["id"]: executor.submit(fetch_text, league_cfg["payroll_url"], cache_dir)
+            for league_cfg in LEAGUES
+        }
+        transfer_futures = {
+            (league_cfg["id"], transfer_year): executor.submit(
+                fetch_text,
+                TRANSFERS_URL.format(league_path=league_cfg["transfer_path"], season=transfer_year),
+                cache_dir,
+            )
+            for league_cfg in LEAGUES
+            for transfer_year in transfer_years
+        }
+
     for league_cfg in LEAGUES:
         league_id = league_cfg["id"]
         league_label = league_cfg["label"]
@@ -535,7 +905,7 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
         transfer_path = league_cfg["transfer_path"]
         transfer_names = set(league_cfg["transfer_names"])
 
-        payroll_page = fetch_text(payroll_url)
+        payroll_page = payroll_futures[league_id].result()
         payroll_rows = parse_capology_payrolls(payroll_page)
         if not payroll_rows:
             print(f"Warning: no payroll rows parsed for {league_label}")
@@ -545,17 +915,22 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
         canonical_map = {normalize_text(club): club for club in clubs}
 
         transfer_rows: Dict[str, dict] = {}
+        current_transfer_rows: Dict[str, dict] = {}
         fetched_transfer_seasons: List[int] = []
-        for transfer_year in range(transfer_start_year, season_year + 1):
+        club_by_raw_name: Dict[str, Optional[str]] = {}
+        for transfer_year in transfer_years:
             try:
-                transfer_csv = fetch_text(TRANSFERS_URL.format(league_path=transfer_path, season=transfer_year))
+                transfer_csv = transfer_futures[(league_id, transfer_year)].result()
                 season_rows = parse_transfers_csv(
                     transfer_csv,
                     season_year=transfer_year,
                     canonical_map=canonical_map,
                     transfer_names=transfer_names,
+                    club_by_raw_name=club_by_raw_name,
                 )
                 merge_transfer_rows(transfer_rows, season_rows)
+                if transfer_year == season_year:
+                    current_transfer_rows = season_rows
                 fetched_transfer_seasons.append(transfer_year)
             except RuntimeError as exc:
                 print(f"Warning: skipping {league_label} transfer season {transfer_year}: {exc}")
@@ -570,61 +945,74 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
             wage_by_club[club] = row["annual_gross_gbp"]
             slug_by_club[club] = row["slug"]
 
+        salary_errors: Dict[str, RuntimeError] = {}
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fetch_executor:
+            club_by_fetch = {
+                fetch_executor.submit(fetch_text, CLUB_SALARIES_URL.format(slug=slug_by_club[club]), cache_dir): club
+                for club in clubs
+            }
+            for fetch_future in as_completed(club_by_fetch):
+                club = club_by_fetch[fetch_future]
+                try:
+                    salary_contracts[club] = parse_capology_salary_contracts(fetch_future.result())
+                except RuntimeError as exc:
+                    salary_errors[club] = exc
+
         for club in clubs:
-            slug = slug_by_club[club]
-            try:
-                salary_page = fetch_text(CLUB_SALARIES_URL.format(slug=slug))
-                salary_contracts[club] = parse_capology_salary_contracts(salary_page)
-            except RuntimeError as exc:
-                print(f"Warning: no salary contracts for {league_label} {club}: {exc}")
+            if club in salary_errors:
+                print(f"Warning: no salary contracts for {league_label} {club}: {salary_errors[club]}")
                 salary_contracts[club] = {}
-            time.sleep(0.25)
 
         for club in clubs:
             all_incoming = transfer_rows.get(club, {}).get("in", [])
             all_outgoing = transfer_rows.get(club, {}).get("out", [])
-            incoming = [move for move in all_incoming if int(move.get("season") or 0) == season_year]
-            outgoing = [move for move in all_outgoing if int(move.get("season") or 0) == season_year]
+            incoming = current_transfer_rows.get(club, {}).get("in", [])
+            outgoing = current_transfer_rows.get(club, {}).get("out", [])
+            club_norm = normalize_text(club)
             contracts = salary_contracts.get(club, {})
+            contract_candidates = list(contracts.keys())
+            contract_token_index = build_token_index(contract_candidates)
+            terms_by_key: Dict[tuple, dict] = {}
+            max_contract_years = max(
+                PROFILE_MAX_CONTRACT_YEARS,
+                override_years_by_club.get(club_norm, 0),
+                *(
+                    infer_contract_years_from_dates(record.get("signed"), record.get("expiration")) or 0
+                    for record in contracts.values()
+                ),
+            )
             outgoing_by_player: Dict[str, List[int]] = {}
             for out_move in all_outgoing:
                 season = int(out_move.get("season") or 0)
                 if season <= 0:
                     continue
-                outgoing_by_player.setdefault(normalize_text(out_move["player"]), []).append(season)
+                outgoing_by_player.setdefault(out_move["player_norm"], []).append(season)
+            for out_seasons in outgoing_by_player.values():
+                out_seasons.sort()
 
             club_in_rows: List[dict] = []
-            reported = 0
-            fuzzy = 0
-            assumed = 0
-            overridden = 0
+            confidence_counts: Counter[str] = Counter()
 
             for move in incoming:
                 total_incoming += 1
-                terms = resolve_contract_terms(move, club, contracts, overrides)
+                terms_key = contract_terms_key(move)
+                terms = terms_by_key.get(terms_key)
+                if terms is None:
+                    terms = terms_by_key[terms_key] = resolve_contract_terms(
+                        move, club_norm, overrides, contracts, contract_candidates, contract_token_index
+                    )
                 contract_years = terms["contract_years"]
                 confidence = terms["contract_confidence"]
                 reason = terms["contract_note"]
                 annual_wage = terms["annual_wage_gbp"]
-                annual_amortization = int(round((move["fee"] or 0) / max(1, contract_years)))
-
-                if confidence == "override":
-                    overridden += 1
-                elif confidence in {"reported", "reported_loan"}:
-                    reported += 1
-                elif confidence == "reported_fuzzy_match":
-                    fuzzy += 1
-                elif confidence == "assumed_profile":
-                    assumed += 1
-
-                if confidence in {"reported", "reported_fuzzy_match", "reported_loan", "override"}:
-                    total_reported += 1
+                annual_amortization = terms["annual_amortization"]
+                confidence_counts[confidence] += 1
 
                 club_in_rows.append(
                     {
                         "player": move["player"],
                         "fee": int(round(move["fee"])),
-                        "contract_years": int(contract_years),
+                        "contract_years": contract_years,
                         "contract_confidence": confidence,
                         "contract_note": reason,
                         "annual_amortization": annual_amortization,
@@ -638,6 +1026,12 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
                     }
                 )
 
+            reported = confidence_counts["reported"] + confidence_counts["reported_loan"]
+            fuzzy = confidence_counts["reported_fuzzy_match"]
+            assumed = confidence_counts["assumed_profile"]
+            overridden = confidence_counts["override"]
+            total_reported += reported + fuzzy + overridden
+
             club_out_rows: List[dict] = []
             for move in outgoing:
                 club_out_rows.append(
@@ -661,16 +1055,23 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
                     continue
                 if (move.get("fee") or 0) <= 0:
                     continue
-                if player_left_club_after_incoming(move["player"], source_season, outgoing_by_player, season_year):
+                years_elapsed = season_year - source_season
+                if years_elapsed >= max_contract_years:
+                    continue
+                if player_left_club_after_incoming(move["player_norm"], source_season, outgoing_by_player, season_year):
                     continue
 
-                terms = resolve_contract_terms(move, club, contracts, overrides)
-                contract_years = int(terms["contract_years"])
-                years_elapsed = season_year - source_season
-                if years_elapsed < 0 or years_elapsed >= contract_years:
+                terms_key = contract_terms_key(move)
+                terms = terms_by_key.get(terms_key)
+                if terms is None:
+                    terms = terms_by_key[terms_key] = resolve_contract_terms(
+                        move, club_norm, overrides, contracts, contract_candidates, contract_token_index
+                    )
+                contract_years = terms["contract_years"]
+                if years_elapsed >= contract_years:
                     continue
 
-                annual_amortization = int(round((move["fee"] or 0) / max(1, contract_years)))
+                annual_amortization = terms["annual_amortization"]
                 years_remaining = max(1, contract_years - years_elapsed)
                 annual_wage = terms["annual_wage_gbp"]
                 total_annual_cost = annual_amortization + (annual_wage or 0)
@@ -700,7 +1101,10 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
                     }
                 )
 
-            club_id = f"{normalize_text(club).replace(' ', '_')}_{league_id}_{season_year}"
+            club_in_rows.sort(key=itemgetter("fee"), reverse=True)
+            club_out_rows.sort(key=itemgetter("fee"), reverse=True)
+            amortization_assets.sort(key=itemgetter("annual_amortization", "fee"), reverse=True)
+            club_id = f"{club_norm.replace(' ', '_')}_{league_id}_{season_year}"
             output_clubs.append(
                 {
                     "team_id": club_id,
@@ -709,13 +1113,9 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
                     "season": season_label,
                     "wage_bill": int(round(wage_by_club.get(club, 0))),
                     "wage_source": f"capology_payrolls_{league_id}",
-                    "transfers_in": sorted(club_in_rows, key=lambda row: row["fee"], reverse=True),
-                    "transfers_out": sorted(club_out_rows, key=lambda row: row["fee"], reverse=True),
-                    "amortization_assets": sorted(
-                        amortization_assets,
-                        key=lambda row: (row["annual_amortization"], row["fee"]),
-                        reverse=True,
-                    ),
+                    "transfers_in": club_in_rows,
+                    "transfers_out": club_out_rows,
+                    "amortization_assets": amortization_assets,
                     "amortization_summary": {
                         "annual_current_window": annual_amortization_current,
                         "annual_prior_windows": annual_amortization_carryover,
@@ -771,6 +1171,7 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
 
     active_leagues = [cfg["label"] for cfg in LEAGUES if any(c["league"] == cfg["label"] for c in output_clubs)]
     league_scope_label = " + ".join(active_leagues)
+    output_clubs.sort(key=itemgetter("league", "team_name"))
 
     payload = {
         "last_updated": fetched_at.strftime("%Y-%m-%d"),
@@ -815,13 +1216,11 @@ def build_dataset(output_path: Path, season_year: int, overrides_path: Path, his
                 "type": "contract_dates",
             },
         ],
-        "clubs": sorted(output_clubs, key=lambda row: (row["league"], row["team_name"])),
+        "clubs": output_clubs,
     }
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(payload, f, indent=2)
-        f.write("\n")
+    write_json(output_path, payload, compact=compact)
 
 
 def main() -> None:
@@ -845,6 +1244,18 @@ def main() -> None:
         default=Path("data/contract_overrides.json"),
         help="Manual contract override JSON (default: data/contract_overrides.json)",
     )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=Path(".cache/pages"),
+        help="Directory for cached page downloads, reused for 6 hours (default: .cache/pages)",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always re-download pages; skip the page cache")
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write minified JSON instead of the indented form committed to the repo",
+    )
     args = parser.parse_args()
 
     build_dataset(
@@ -852,6 +1263,8 @@ def main() -> None:
         season_year=args.season_year,
         overrides_path=args.overrides,
         history_years=args.history_years,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        compact=args.compact,
     )
 
 